@@ -1,26 +1,97 @@
 """
 Article endpoints for CRUD operations
 """
-from typing import List, Optional
-from datetime import datetime
+import asyncio
+import base64
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from app.models.schemas import (
     ArticleCreate,
     ArticleUpdate,
     ArticleResponse,
     ArticleListResponse
 )
-from app.dependencies import get_database
-from app.database import Database
+from app.dependencies import get_article_service
 from app.services.article_service import ArticleService
+from app.config import settings
+from app.utils.cache import response_cache
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 router = APIRouter()
 
+# Cache namespace for all article responses; writes invalidate it as a whole
+_CACHE_PREFIX = "articles:"
 
-@router.get("/articles", response_model=ArticleListResponse)
+# Validates a whole page of rows in one call into the compiled core schema
+_ARTICLE_LIST_ADAPTER = TypeAdapter(List[ArticleResponse])
+
+
+def _parse_date_param(value: Optional[str], name: str) -> Optional[datetime]:
+    """
+    Parse an ISO date/datetime query parameter
+    
+    Args:
+        value: Raw query parameter value
+        name: Parameter name used in the error message
+        
+    Returns:
+        Timezone-aware datetime (naive values are treated as UTC) or None
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Invalid {name} format. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
+        )
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _encode_cursor(created_at: datetime, article_id: int) -> str:
+    """
+    Encode the keyset position of an article as an opaque URL-safe cursor
+    
+    Args:
+        created_at: Article creation time
+        article_id: Article ID
+        
+    Returns:
+        Cursor string
+    """
+    raw = f"{created_at.isoformat()}|{article_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(value: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    Decode a cursor produced by _encode_cursor
+    
+    Args:
+        value: Raw cursor query parameter value
+        
+    Returns:
+        Tuple of (created_at, id) or None
+    """
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+        created_at, article_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(article_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/articles", response_model=ArticleListResponse, response_class=ORJSONResponse)
 async def get_articles(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
@@ -32,7 +103,11 @@ async def get_articles(
         None, 
         description="Filter articles until this date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
     ),
-    db: Database = Depends(get_database)
+    cursor: Optional[str] = Query(
+        None,
+        description="next_cursor from the previous page; seeks instead of using page offsets"
+    ),
+    service: ArticleService = Depends(get_article_service)
 ):
     """
     Get all articles with pagination and optional date filtering
@@ -42,53 +117,72 @@ async def get_articles(
         - page_size: Number of items per page (1-100)
         - date_from: Filter articles created from this date (e.g., "2025-12-20" or "2025-12-20T00:00:00")
         - date_to: Filter articles created until this date (e.g., "2025-12-28" or "2025-12-28T23:59:59")
+        - cursor: next_cursor of the previous response; fetches the following page by keyset
+          (constant cost for deep pages; page is ignored and returned as null)
     
     Examples:
         - Get all articles: GET /api/v1/articles
         - Get articles from Dec 20: GET /api/v1/articles?date_from=2025-12-20
         - Get articles between dates: GET /api/v1/articles?date_from=2025-12-20&date_to=2025-12-28
         - Get articles on specific date: GET /api/v1/articles?date_from=2025-12-28&date_to=2025-12-28
+        - Get the next page: GET /api/v1/articles?cursor=<next_cursor>
     
     Returns:
         Paginated list of articles filtered by created date
     """
+    cache_key = await response_cache.versioned_key(
+        _CACHE_PREFIX, f"list:{page}:{page_size}:{date_from}:{date_to}:{cursor}"
+    )
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        # Already serialized by the response model, skip re-validation
+        return ORJSONResponse(cached)
+    
     try:
-        # Validate date formats if provided
-        if date_from:
-            try:
-                datetime.fromisoformat(date_from.replace('Z', '+00:00'))
-            except ValueError:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="Invalid date_from format. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
-                )
+        # Parse date filters once; the driver binds them as timestamptz
+        dt_from = _parse_date_param(date_from, "date_from")
+        dt_to = _parse_date_param(date_to, "date_to")
+        after = _decode_cursor(cursor)
         
-        if date_to:
-            try:
-                datetime.fromisoformat(date_to.replace('Z', '+00:00'))
-            except ValueError:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="Invalid date_to format. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
-                )
+        if after is not None:
+            # Keyset page; the total ignores the cursor, so count concurrently
+            articles, total = await asyncio.gather(
+                service.get_all_articles(
+                    limit=page_size,
+                    date_from=dt_from,
+                    date_to=dt_to,
+                    cursor=after
+                ),
+                service.count_articles(date_from=dt_from, date_to=dt_to)
+            )
+        else:
+            offset = (page - 1) * page_size
+            
+            # Page and total count in a single round trip
+            articles, total = await service.list_with_total(
+                limit=page_size, 
+                offset=offset,
+                date_from=dt_from,
+                date_to=dt_to
+            )
         
-        service = ArticleService(db)
-        offset = (page - 1) * page_size
+        next_cursor = None
+        if len(articles) == page_size:
+            last = articles[-1]
+            next_cursor = _encode_cursor(last["created_at"], last["id"])
         
-        articles = await service.get_all_articles(
-            limit=page_size, 
-            offset=offset,
-            date_from=date_from,
-            date_to=date_to
-        )
-        total = await service.count_articles(date_from=date_from, date_to=date_to)
-        
-        return ArticleListResponse(
-            items=[ArticleResponse(**article) for article in articles],
+        response = ArticleListResponse(
+            items=_ARTICLE_LIST_ADAPTER.validate_python(articles),
             total=total,
-            page=page,
-            page_size=page_size
+            page=page if after is None else None,
+            page_size=page_size,
+            next_cursor=next_cursor
         )
+        # Serialize once for both the cache and the response; returning the
+        # model would make FastAPI dump and re-validate it before encoding
+        payload = response.model_dump(mode="json")
+        await response_cache.set(cache_key, payload, settings.ARTICLE_LIST_CACHE_TTL)
+        return ORJSONResponse(payload)
     except HTTPException:
         raise
     except Exception as e:
@@ -99,26 +193,35 @@ async def get_articles(
 @router.get("/articles/{article_id}", response_model=ArticleResponse)
 async def get_article(
     article_id: int,
-    db: Database = Depends(get_database)
+    service: ArticleService = Depends(get_article_service)
 ):
     """
     Get article by ID
     
     Args:
         article_id: Article ID
-        db: Database dependency
+        service: Article service dependency
         
     Returns:
         Article details
     """
+    cache_key = await response_cache.versioned_key(_CACHE_PREFIX, f"item:{article_id}")
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        # Already serialized by the response model, skip re-validation
+        return ORJSONResponse(cached)
+    
     try:
-        service = ArticleService(db)
         article = await service.get_article_by_id(article_id)
         
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
         
-        return ArticleResponse(**article)
+        response = ArticleResponse(**article)
+        await response_cache.set(
+            cache_key, response.model_dump(mode="json"), settings.ARTICLE_CACHE_TTL
+        )
+        return response
     except HTTPException:
         raise
     except Exception as e:
@@ -129,21 +232,21 @@ async def get_article(
 @router.post("/articles", response_model=ArticleResponse, status_code=201)
 async def create_article(
     article: ArticleCreate,
-    db: Database = Depends(get_database)
+    service: ArticleService = Depends(get_article_service)
 ):
     """
     Create a new article
     
     Args:
         article: Article creation data
-        db: Database dependency
+        service: Article service dependency
         
     Returns:
         Created article
     """
     try:
-        service = ArticleService(db)
         created_article = await service.create_article(article)
+        await response_cache.invalidate(_CACHE_PREFIX)
         return ArticleResponse(**created_article)
     except Exception as e:
         logger.error(f"Error creating article: {e}")
@@ -154,7 +257,7 @@ async def create_article(
 async def update_article(
     article_id: int,
     article: ArticleUpdate,
-    db: Database = Depends(get_database)
+    service: ArticleService = Depends(get_article_service)
 ):
     """
     Update an article
@@ -162,18 +265,18 @@ async def update_article(
     Args:
         article_id: Article ID
         article: Article update data
-        db: Database dependency
+        service: Article service dependency
         
     Returns:
         Updated article
     """
     try:
-        service = ArticleService(db)
         updated_article = await service.update_article(article_id, article)
         
         if not updated_article:
             raise HTTPException(status_code=404, detail="Article not found")
         
+        await response_cache.invalidate(_CACHE_PREFIX)
         return ArticleResponse(**updated_article)
     except HTTPException:
         raise
@@ -185,21 +288,22 @@ async def update_article(
 @router.delete("/articles/{article_id}", status_code=204)
 async def delete_article(
     article_id: int,
-    db: Database = Depends(get_database)
+    service: ArticleService = Depends(get_article_service)
 ):
     """
     Delete an article
     
     Args:
         article_id: Article ID
-        db: Database dependency
+        service: Article service dependency
     """
     try:
-        service = ArticleService(db)
         deleted = await service.delete_article(article_id)
         
         if not deleted:
             raise HTTPException(status_code=404, detail="Article not found")
+        
+        await response_cache.invalidate(_CACHE_PREFIX)
     except HTTPException:
         raise
     except Exception as e:
@@ -2,6 +2,8 @@
 Health check endpoint
 """
 from datetime import datetime
+from time import monotonic
+from typing import Tuple
 from fastapi import APIRouter, Depends
 from app.models.schemas import HealthResponse
 from app.dependencies import get_database
@@ -13,22 +15,34 @@ logger = setup_logger(__name__)
 
 router = APIRouter()
 
+# Last database probe as (monotonic timestamp, status), kept per worker
+_last_db_check: Tuple[float, str] = (float("-inf"), "disconnected")
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check(db: Database = Depends(get_database)):
     """
     Health check endpoint to verify API and database connectivity
     
+    The database probe result is reused for HEALTH_CHECK_CACHE_TTL seconds so
+    bursts of health checks do not hammer Postgres.
+    
     Returns:
         Health status information
     """
-    try:
-        # Test database connection
-        await db.fetchval("SELECT 1 as test")
-        db_status = "connected"
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
-        db_status = "disconnected"
+    global _last_db_check
+    
+    checked_at, db_status = _last_db_check
+    now = monotonic()
+    if now - checked_at >= settings.HEALTH_CHECK_CACHE_TTL:
+        try:
+            # Test database connection (pre-ping on checkout, no session or transaction)
+            await db.ping()
+            db_status = "connected"
+        except Exception as e:
+            logger.error(f"Database health check failed: {e}")
+            db_status = "disconnected"
+        _last_db_check = (now, db_status)
     
     return HealthResponse(
         status="healthy" if db_status == "connected" else "degraded",
@@ -1,8 +1,9 @@
 """
 Configuration module for loading environment variables from .env file
 """
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -24,6 +25,26 @@ class Settings(BaseSettings):
     port: str = ""
     dbname: str = ""
     
+    # Set to True when connecting through a transaction-mode pooler (PgBouncer / Supavisor),
+    # which cannot keep prepared statements across transactions.
+    # Leave unset to auto-detect from the Supabase transaction pooler port (6543).
+    DB_TRANSACTION_POOLER: Optional[bool] = None
+    
+    # Connection Pool Settings, per worker process
+    # (keep WORKERS * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below Postgres/pooler max_connections)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800  # Recycle connections after 30 minutes
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_USE_NULL_POOL: bool = False  # Disable client-side pooling when PgBouncer does the pooling
+    
+    # Prepared statement caches per connection (ignored behind a transaction pooler)
+    DB_STATEMENT_CACHE_SIZE: int = 1024  # asyncpg statement cache
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500  # SQLAlchemy asyncpg dialect cache
+    # Send jit=off as a startup parameter on direct connections (never sent through
+    # poolers, which reject unknown startup parameters)
+    DB_DISABLE_JIT: bool = True
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Build DATABASE_URL from individual parameters if DATABASE_URL is not provided
@@ -45,6 +66,10 @@ class Settings(BaseSettings):
     # Server Configuration
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    WORKERS: int = 1  # Each worker opens its own DB pool; ignored when reloading (DEBUG)
+    # Per-worker cap on open connections + tasks before 503 (None = unlimited);
+    # counts idle keep-alive sockets, so it is not a DB concurrency limit
+    LIMIT_CONCURRENCY: Optional[int] = None
     
     # CORS Settings
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:8080"
@@ -56,9 +81,23 @@ class Settings(BaseSettings):
     RATE_LIMIT_PER_MINUTE: int = 60  # Requests per minute per IP
     RATE_LIMIT_PER_HOUR: int = 1000  # Requests per hour per IP
     
-    @property
+    # Redis (shared rate limit counters across workers); leave empty for in-process limits
+    REDIS_URL: str = ""
+    # Seconds before a stalled Redis command/connect fails over to the in-process fallback
+    REDIS_SOCKET_TIMEOUT: float = 0.1
+    REDIS_CONNECT_TIMEOUT: float = 1
+    
+    # Response cache TTLs in seconds (0 disables caching); without Redis the
+    # cache is in-process and only used when WORKERS is 1
+    ARTICLE_LIST_CACHE_TTL: float = 5
+    ARTICLE_CACHE_TTL: float = 30
+    HEALTH_CHECK_CACHE_TTL: float = 2
+    # Reuse of the unfiltered article total (planner estimate) in seconds
+    ARTICLE_COUNT_ESTIMATE_TTL: float = 60
+    
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """Convert CORS_ORIGINS string to list"""
+        """Convert CORS_ORIGINS string to list (computed once)"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
     
     class Config:
@@ -68,6 +107,17 @@ class Settings(BaseSettings):
         extra = "ignore"  # Ignore extra fields in .env file
 
 
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Get the cached settings instance
+    
+    Returns:
+        Settings loaded once from the environment
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
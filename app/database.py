@@ -1,10 +1,15 @@
 """
 Database connection module for Supabase PostgreSQL using SQLAlchemy
 """
+from functools import lru_cache
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.pool import NullPool
 from sqlalchemy import text
-from typing import Optional, List, Dict, Any
+from sqlalchemy.sql.elements import TextClause
+from typing import Optional, List, Dict, Any, Mapping, Sequence
 from app.config import settings
 from app.utils.logger import setup_logger
 
@@ -14,11 +19,27 @@ logger = setup_logger(__name__)
 Base = declarative_base()
 
 
+@lru_cache(maxsize=256)
+def _text(query: str) -> TextClause:
+    """
+    Get the TextClause for a SQL string, parsing its bind parameters only once
+    
+    Args:
+        query: SQL query string (callers pass module-level constants)
+        
+    Returns:
+        Cached TextClause; identical SQL text also maps to one asyncpg prepared statement
+    """
+    return text(query)
+
+
 class Database:
     """Database connection manager using SQLAlchemy"""
     
     def __init__(self):
         self.engine: Optional[Any] = None
+        self.autocommit_engine: Optional[Any] = None
+        self.transaction_pooler = False
         self.async_session_maker: Optional[async_sessionmaker] = None
     
     def _build_database_url(self) -> str:
@@ -28,21 +49,36 @@ class Database:
         Returns:
             Database URL string for SQLAlchemy
         """
-        # If DATABASE_URL is provided, use it directly
+        # If DATABASE_URL is provided, point it at the asyncpg driver
         if settings.DATABASE_URL:
-            # SQLAlchemy async uses postgresql+psycopg:// for psycopg v3
-            # Convert postgres:// or postgresql:// to postgresql+psycopg:// for async support
-            db_url = settings.DATABASE_URL
-            if db_url.startswith('postgres://'):
-                db_url = db_url.replace('postgres://', 'postgresql+psycopg://', 1)
-            elif db_url.startswith('postgresql://'):
-                # Only replace if not already using a driver
-                if '+psycopg' not in db_url and '+asyncpg' not in db_url:
-                    db_url = db_url.replace('postgresql://', 'postgresql+psycopg://', 1)
-            return db_url
+            # Only the scheme is rewritten; the rest stays percent-encoded as given
+            scheme, _, rest = settings.DATABASE_URL.partition('://')
+            if scheme in ('postgres', 'postgresql') or scheme.startswith('postgresql+psycopg'):
+                # Plain and psycopg URLs (asyncpg is the only installed driver)
+                scheme = 'postgresql+asyncpg'
+            elif scheme != 'postgresql+asyncpg':
+                raise ValueError(
+                    f"Unsupported DATABASE_URL driver '{scheme}'. "
+                    "Use postgresql:// (connects with asyncpg)"
+                )
+            return f"{scheme}://{rest}"
         
         raise ValueError("DATABASE_URL is required")
     
+    def _uses_transaction_pooler(self, url: URL) -> bool:
+        """
+        Check whether connections go through a transaction-mode pooler
+        
+        Args:
+            url: SQLAlchemy database URL
+            
+        Returns:
+            True if prepared statements must not be reused across transactions
+        """
+        if settings.DB_TRANSACTION_POOLER is not None:
+            return settings.DB_TRANSACTION_POOLER
+        return url.port == 6543
+    
     async def connect(self, retries: int = 3, delay: int = 5):
         """
         Create database connection engine with retry logic
@@ -78,6 +114,47 @@ class Database:
             logger.error(error_msg)
             raise ValueError(error_msg)
         
+        url = make_url(db_url)
+        if "sslmode" in url.query:
+            # libpq's sslmode query option is called ssl in asyncpg
+            url = url.difference_update_query(["sslmode"]).update_query_dict(
+                {"ssl": url.query["sslmode"]}
+            )
+        
+        connect_args = {
+            "timeout": 10,  # 10 second connection timeout
+        }
+        self.transaction_pooler = self._uses_transaction_pooler(url)
+        if self.transaction_pooler:
+            # Transaction poolers hand out a different server connection per transaction,
+            # so asyncpg must not cache prepared statements and needs unique statement names
+            logger.info("Transaction pooler detected, disabling prepared statement caches")
+            url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        else:
+            # Cache prepared statements per connection so repeated queries skip parse/plan
+            url = url.update_query_dict(
+                {"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)}
+            )
+            connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+            # JIT compilation only slows down short OLTP queries. Poolers (PgBouncer behind
+            # DB_USE_NULL_POOL included) reject unknown startup parameters, so only set it
+            # on direct connections
+            if settings.DB_DISABLE_JIT and not settings.DB_USE_NULL_POOL:
+                connect_args["server_settings"] = {"jit": "off"}
+        
+        if settings.DB_USE_NULL_POOL:
+            # External pooler (e.g. PgBouncer) manages connections, open one per checkout
+            pool_args = {"poolclass": NullPool}
+        else:
+            pool_args = {
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "pool_recycle": settings.DB_POOL_RECYCLE,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+            }
+        
         last_exception = None
         
         for attempt in range(1, retries + 1):
@@ -86,16 +163,18 @@ class Database:
                 
                 # Create async engine with connection pooling
                 self.engine = create_async_engine(
-                    db_url,
-                    pool_size=5,
-                    max_overflow=10,
+                    url,
+                    **pool_args,
                     pool_pre_ping=True,  # Verify connections before using
                     echo=settings.DEBUG,  # Log SQL queries in debug mode
-                    connect_args={
-                        "connect_timeout": 10,  # 10 second connection timeout
-                    }
+                    connect_args=connect_args
                 )
                 
+                # Autocommit view of the same pool for single-statement queries
+                # (skips the BEGIN/COMMIT round trips of an explicit transaction;
+                # not used behind transaction poolers, see _statement_connection)
+                self.autocommit_engine = self.engine.execution_options(isolation_level="AUTOCOMMIT")
+                
                 # Create async session maker
                 self.async_session_maker = async_sessionmaker(
                     self.engine,
@@ -145,7 +224,51 @@ class Database:
             raise RuntimeError("Database not connected. Call connect() first.")
         return self.async_session_maker()
     
-    async def fetch(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+    def _get_autocommit_engine(self) -> Any:
+        """
+        Get the autocommit engine used for single-statement queries
+        
+        Returns:
+            AsyncEngine with AUTOCOMMIT isolation level
+        """
+        if not self.autocommit_engine:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        return self.autocommit_engine
+    
+    def _statement_connection(self) -> Any:
+        """
+        Open a connection for a single statement
+        
+        Uses autocommit on direct and session-mode connections. Behind a
+        transaction pooler the statement runs inside BEGIN...COMMIT instead:
+        asyncpg sends Parse and Bind as separate messages, and without a
+        transaction the pooler may route them to different backends, where the
+        prepared statement does not exist.
+        
+        Returns:
+            Async context manager yielding an AsyncConnection
+        """
+        if self.transaction_pooler:
+            if not self.engine:
+                raise RuntimeError("Database not connected. Call connect() first.")
+            return self.engine.begin()
+        return self._get_autocommit_engine().connect()
+    
+    async def ping(self) -> None:
+        """
+        Check database liveness with a single round trip
+        
+        Checking out a connection runs the pool's pre-ping (or opens a fresh
+        connection), which already proves the database is reachable, so no
+        extra query is sent.
+        
+        Raises:
+            Exception: If no working connection can be obtained
+        """
+        async with self._get_autocommit_engine().connect():
+            pass
+    
+    async def fetch(self, query: str, **kwargs) -> List[Mapping[str, Any]]:
         """
         Execute SELECT query and return results
         
@@ -154,17 +277,19 @@ class Database:
             **kwargs: Query parameters as keyword arguments
             
         Returns:
-            List of dictionaries representing rows
+            List of read-only row mappings (column name -> value)
         """
-        async with await self.get_session() as session:
-            result = await session.execute(text(query), kwargs)
-            rows = result.fetchall()
-            # Convert rows to dictionaries
-            return [dict(row._mapping) for row in rows]
+        async with self._statement_connection() as conn:
+            result = await conn.execute(_text(query), kwargs)
+            # Row mappings wrap the driver rows without copying them into dicts
+            return result.mappings().all()
     
     async def fetchrow(self, query: str, **kwargs) -> Optional[Dict[str, Any]]:
         """
-        Execute SELECT query and return single row
+        Execute query and return single row
+        
+        Commits (autocommit, or a transaction behind a transaction pooler), so
+        single INSERT/UPDATE/DELETE ... RETURNING statements are persisted as well.
         
         Args:
             query: SQL query string with named parameters (:param_name)
@@ -173,8 +298,8 @@ class Database:
         Returns:
             Dictionary representing row or None if not found
         """
-        async with await self.get_session() as session:
-            result = await session.execute(text(query), kwargs)
+        async with self._statement_connection() as conn:
+            result = await conn.execute(_text(query), kwargs)
             row = result.fetchone()
             return dict(row._mapping) if row else None
     
@@ -189,14 +314,14 @@ class Database:
         Returns:
             Single value or None
         """
-        async with await self.get_session() as session:
-            result = await session.execute(text(query), kwargs)
+        async with self._statement_connection() as conn:
+            result = await conn.execute(_text(query), kwargs)
             row = result.fetchone()
             return row[0] if row else None
     
     async def execute(self, query: str, **kwargs) -> Any:
         """
-        Execute INSERT/UPDATE/DELETE query
+        Execute INSERT/UPDATE/DELETE query in a transaction
         
         Args:
             query: SQL query string with named parameters (:param_name)
@@ -205,10 +330,28 @@ class Database:
         Returns:
             Result object
         """
-        async with await self.get_session() as session:
-            result = await session.execute(text(query), kwargs)
-            await session.commit()
-            return result
+        if not self.engine:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        async with self.engine.begin() as conn:
+            return await conn.execute(_text(query), kwargs)
+    
+    async def executemany(self, query: str, params: Sequence[Dict[str, Any]]) -> None:
+        """
+        Execute INSERT/UPDATE/DELETE query for many parameter sets in one transaction
+        
+        The asyncpg dialect sends all parameter sets through a single prepared
+        statement instead of one round trip per row.
+        
+        Args:
+            query: SQL query string with named parameters (:param_name)
+            params: One dictionary of query parameters per row
+        """
+        if not params:
+            return
+        if not self.engine:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        async with self.engine.begin() as conn:
+            await conn.execute(_text(query), list(params))
 
 
 # Global database instance
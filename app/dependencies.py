@@ -4,6 +4,10 @@ Shared dependencies for FastAPI routes
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import db
+from app.services.article_service import ArticleService
+
+# ArticleService is stateless apart from the shared Database, so one instance serves all requests
+_article_service = ArticleService(db)
 
 
 async def get_database():
@@ -26,3 +30,12 @@ async def get_db_session() -> AsyncSession:
     async with await db.get_session() as session:
         yield session
 
+
+async def get_article_service() -> ArticleService:
+    """
+    Dependency to get the shared article service
+    
+    Returns:
+        ArticleService instance
+    """
+    return _article_service
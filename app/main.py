@@ -3,16 +3,17 @@ FastAPI application entry point
 """
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.config import settings
 from app.database import db
+from app.redis_client import redis_client
 from app.api.v1.router import api_router
 from app.middleware.cors import setup_cors
-from app.middleware.logging import LoggingMiddleware
-from app.middleware.security import SecurityHeadersMiddleware, APIKeyMiddleware
-from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.combined import EdgeMiddleware
+from app.middleware.security import SecurityHeadersMiddleware
 from app.middleware.error_handler import (
     validation_exception_handler,
     http_exception_handler,
@@ -45,6 +46,7 @@ async def lifespan(app: FastAPI):
     
     try:
         await db.connect(retries=3, delay=5)
+        await redis_client.connect()
         logger.info("Application startup complete")
     except Exception as e:
         logger.error(f"Failed to start application: {e}")
@@ -55,6 +57,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application")
+    await redis_client.disconnect()
     await db.disconnect()
     logger.info("Application shutdown complete")
 
@@ -65,6 +68,7 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="Backend API for Article Generator with Supabase PostgreSQL",
     debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,  # orjson serializes much faster than stdlib json
     lifespan=lifespan
 )
 
@@ -73,22 +77,15 @@ app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
-# Add API key middleware (executes last in middleware chain)
-app.add_middleware(
-    APIKeyMiddleware,
-    exclude_paths=["/", "/docs", "/redoc", "/openapi.json", "/api/v1/health"]
-)
-
-# Add logging middleware
-app.add_middleware(LoggingMiddleware)
+# Add edge middleware: logging, rate limiting and API key auth in a single ASGI
+# layer (runs inside CORS so preflight requests skip API key checks)
+app.add_middleware(EdgeMiddleware)
 
 # Setup CORS
 setup_cors(app)
 
-# Add rate limiting middleware
-app.add_middleware(RateLimitMiddleware)
-
-# Add security headers middleware (executes first in chain)
+# Add security headers middleware (executes first in chain, so CORS preflight
+# responses get the headers too)
 app.add_middleware(SecurityHeadersMiddleware)
 
 # Include API routers (must be after middleware)
@@ -107,11 +104,21 @@ async def root():
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        workers=settings.WORKERS,
+        # uvloop (libuv event loop) is not available on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        backlog=2048,
+        # Max open client connections (idle keep-alive included) plus in-flight
+        # requests before uvicorn answers 503; None means unlimited
+        limit_concurrency=settings.LIMIT_CONCURRENCY,
+        timeout_keep_alive=30
     )
 
@@ -0,0 +1,60 @@
+"""
+Combined edge middleware: logging, rate limiting and API key auth
+"""
+import time
+from typing import Iterable, Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.middleware.logging import is_logged_path, log_request, log_response
+from app.middleware.rate_limit import RateLimiter
+from app.middleware.security import APIKeyAuth
+
+
+class EdgeMiddleware:
+    """
+    Single pure-ASGI middleware replacing the RateLimit/Logging/APIKey chain
+    
+    Per request: path skip checks -> rate limit -> API key -> app, with process-time
+    and rate limit headers added in one send wrapper. Security headers are added by
+    SecurityHeadersMiddleware outside CORS, so preflight responses get them too.
+    """
+    
+    def __init__(self, app: ASGIApp, exclude_paths: Optional[Iterable[str]] = None):
+        self.app = app
+        self.rate_limiter = RateLimiter()
+        self.api_key_auth = APIKeyAuth(exclude_paths)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        logged = is_logged_path(scope["path"])
+        if logged:
+            log_request(scope)
+        
+        status_code = 500
+        
+        error_response, rate_headers = await self.rate_limiter.check(scope)
+        if error_response is None:
+            error_response = self.api_key_auth.check(scope)
+        
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                if logged:
+                    headers.append("X-Process-Time", str(time.perf_counter() - start_time))
+                for name, value in rate_headers:
+                    headers.append(name, value)
+            await send(message)
+        
+        if error_response is not None:
+            await error_response(scope, receive, send_wrapper)
+        else:
+            await self.app(scope, receive, send_wrapper)
+        
+        if logged:
+            log_response(scope, status_code, time.perf_counter() - start_time)
@@ -1,41 +1,45 @@
 """
 Request logging middleware
 """
-import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import logging
+from starlette.types import Scope
+from app.middleware.path_filter import is_log_excluded
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all HTTP requests"""
+def is_logged_path(path: str) -> bool:
+    """Check whether requests to this path are logged and timed"""
+    return not is_log_excluded(path)
+
+
+def log_request(scope: Scope):
+    """
+    Log an incoming request (lazy %-formatting, built only if a handler emits it)
     
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
-        # Log request
+    Args:
+        scope: ASGI HTTP connection scope
+    """
+    if logger.isEnabledFor(logging.INFO):
+        client = scope.get("client")
         logger.info(
-            f"Request: {request.method} {request.url.path} - "
-            f"Client: {request.client.host if request.client else 'Unknown'}"
+            "Request: %s %s - Client: %s",
+            scope["method"], scope["path"], client[0] if client else "Unknown"
         )
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate processing time
-        process_time = time.time() - start_time
-        
-        # Log response
+
+
+def log_response(scope: Scope, status_code: int, process_time: float):
+    """
+    Log a completed response
+    
+    Args:
+        scope: ASGI HTTP connection scope
+        status_code: Response status code
+        process_time: Processing time in seconds
+    """
+    if logger.isEnabledFor(logging.INFO):
         logger.info(
-            f"Response: {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - "
-            f"Time: {process_time:.3f}s"
+            "Response: %s %s - Status: %s - Time: %.3fs",
+            scope["method"], scope["path"], status_code, process_time
         )
-        
-        # Add process time header
-        response.headers["X-Process-Time"] = str(process_time)
-        
-        return response
-
@@ -0,0 +1,56 @@
+"""
+Shared request path classification for middleware skip checks
+"""
+from functools import lru_cache
+from typing import FrozenSet
+
+# Public paths that do not require an API key (exact match only)
+AUTH_SKIP: FrozenSet[str] = frozenset({"/", "/docs", "/redoc", "/openapi.json", "/api/v1/health"})
+
+# Rate limiting exempts the same public paths
+RATE_LIMIT_SKIP: FrozenSet[str] = AUTH_SKIP
+
+# High-frequency probe and docs paths that are not logged
+LOG_SKIP: FrozenSet[str] = frozenset({"/api/v1/health", "/docs", "/redoc", "/openapi.json"})
+
+
+@lru_cache(maxsize=1024)
+def is_auth_excluded(path: str) -> bool:
+    """
+    Check whether a request path skips API key authentication
+    
+    Args:
+        path: Request path from the ASGI scope
+        
+    Returns:
+        True if the path is public
+    """
+    return path in AUTH_SKIP
+
+
+@lru_cache(maxsize=1024)
+def is_rate_limit_excluded(path: str) -> bool:
+    """
+    Check whether a request path skips rate limiting
+    
+    Args:
+        path: Request path from the ASGI scope
+        
+    Returns:
+        True if the path is not rate limited
+    """
+    return path in RATE_LIMIT_SKIP
+
+
+@lru_cache(maxsize=1024)
+def is_log_excluded(path: str) -> bool:
+    """
+    Check whether requests to a path skip logging and timing
+    
+    Args:
+        path: Request path from the ASGI scope
+        
+    Returns:
+        True if the path is not logged
+    """
+    return path in LOG_SKIP
@@ -1,116 +1,209 @@
 """
 Rate limiting middleware
 """
-from collections import defaultdict
+from collections import defaultdict, deque
 from time import time
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import List, Optional, Tuple
+from fastapi import status
+from fastapi.responses import JSONResponse, Response
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers
+from starlette.types import Scope
 from app.config import settings
+from app.middleware.path_filter import is_rate_limit_excluded
+from app.redis_client import redis_client
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Hot-path settings resolved once at import
+_RATE_LIMIT_ENABLED = settings.RATE_LIMIT_ENABLED
+_RPM = settings.RATE_LIMIT_PER_MINUTE
+_RPH = settings.RATE_LIMIT_PER_HOUR
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware"""
+# Count a request in both fixed windows only if it is allowed through, like the
+# in-process fallback; returns the counts including this request
+_HIT_SCRIPT = """
+local minute_count = tonumber(redis.call('GET', KEYS[1]) or '0') + 1
+local hour_count = tonumber(redis.call('GET', KEYS[2]) or '0') + 1
+if minute_count <= tonumber(ARGV[1]) and hour_count <= tonumber(ARGV[2]) then
+    redis.call('INCR', KEYS[1])
+    redis.call('EXPIRE', KEYS[1], 60)
+    redis.call('INCR', KEYS[2])
+    redis.call('EXPIRE', KEYS[2], 3600)
+end
+return {minute_count, hour_count}
+"""
+
+# Seconds between repeated "Redis unavailable" log lines while falling back
+_REDIS_ERROR_LOG_INTERVAL = 60
+
+
+class RateLimiter:
+    """
+    Per-IP request rate limiter
     
-    def __init__(self, app):
-        super().__init__(app)
-        self.requests_per_minute = defaultdict(list)
-        self.requests_per_hour = defaultdict(list)
+    Uses Redis fixed-window counters when REDIS_URL is configured, so limits are
+    shared across uvicorn workers; otherwise falls back to per-process sliding windows.
+    """
+    
+    def __init__(self):
+        # Per-IP request timestamps, oldest first (bounded by the limit)
+        self.requests_per_minute = defaultdict(lambda: deque(maxlen=_RPM))
+        self.requests_per_hour = defaultdict(lambda: deque(maxlen=_RPH))
         self.cleanup_interval = 300  # Clean up old entries every 5 minutes
         self.last_cleanup = time()
+        # Hit script registered with the current Redis client (EVALSHA after the first call)
+        self._hit_script: Optional[AsyncScript] = None
+        self._last_redis_error_log = float("-inf")
+    
+    @staticmethod
+    def _expire(timestamps: deque, cutoff: float):
+        """Drop timestamps at or before cutoff from the front of the window"""
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
     
     def _cleanup_old_entries(self):
-        """Remove old entries to prevent memory leaks"""
+        """Remove idle IPs to prevent memory leaks"""
         current_time = time()
         if current_time - self.last_cleanup < self.cleanup_interval:
             return
         
-        # Clean up minute-based entries older than 1 minute
-        cutoff_minute = current_time - 60
-        for ip in list(self.requests_per_minute.keys()):
-            self.requests_per_minute[ip] = [
-                ts for ts in self.requests_per_minute[ip] if ts > cutoff_minute
-            ]
-            if not self.requests_per_minute[ip]:
-                del self.requests_per_minute[ip]
-        
-        # Clean up hour-based entries older than 1 hour
-        cutoff_hour = current_time - 3600
-        for ip in list(self.requests_per_hour.keys()):
-            self.requests_per_hour[ip] = [
-                ts for ts in self.requests_per_hour[ip] if ts > cutoff_hour
-            ]
-            if not self.requests_per_hour[ip]:
-                del self.requests_per_hour[ip]
+        for windows, period in ((self.requests_per_minute, 60), (self.requests_per_hour, 3600)):
+            cutoff = current_time - period
+            for ip in list(windows.keys()):
+                timestamps = windows[ip]
+                self._expire(timestamps, cutoff)
+                if not timestamps:
+                    del windows[ip]
         
         self.last_cleanup = current_time
     
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, scope: Scope) -> str:
         """Get client IP address"""
+        headers = Headers(scope=scope)
+        
         # Check for forwarded IP (behind proxy)
-        forwarded = request.headers.get("X-Forwarded-For")
+        forwarded = headers.get("X-Forwarded-For")
         if forwarded:
             return forwarded.split(",")[0].strip()
         
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = headers.get("X-Real-IP")
         if real_ip:
             return real_ip
         
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
     
-    async def dispatch(self, request: Request, call_next):
-        # Skip rate limiting for health check and docs
-        if request.url.path in ["/api/v1/health", "/docs", "/redoc", "/openapi.json", "/"]:
-            return await call_next(request)
+    def _hit_memory(self, client_ip: str, current_time: float) -> Tuple[int, int]:
+        """
+        Count a request against the in-process sliding windows
         
-        if not settings.RATE_LIMIT_ENABLED:
-            return await call_next(request)
-        
-        # Cleanup old entries periodically
+        Args:
+            client_ip: Client IP address
+            current_time: Request timestamp
+            
+        Returns:
+            Tuple of (requests this minute, requests this hour) including this one
+        """
         self._cleanup_old_entries()
         
+        minute_requests = self.requests_per_minute[client_ip]
+        self._expire(minute_requests, current_time - 60)
+        hour_requests = self.requests_per_hour[client_ip]
+        self._expire(hour_requests, current_time - 3600)
+        
+        minute_count = len(minute_requests) + 1
+        hour_count = len(hour_requests) + 1
+        
+        # Only record requests that are allowed through
+        if minute_count <= _RPM and hour_count <= _RPH:
+            minute_requests.append(current_time)
+            hour_requests.append(current_time)
+        
+        return minute_count, hour_count
+    
+    async def _hit_redis(self, client: Redis, client_ip: str, current_time: float) -> Tuple[int, int]:
+        """
+        Count a request against fixed-window Redis counters shared by all workers
+        
+        Like the in-process windows, rejected requests are not counted.
+        
+        Args:
+            client: Redis client
+            client_ip: Client IP address
+            current_time: Request timestamp
+            
+        Returns:
+            Tuple of (requests this minute, requests this hour) including this one
+        """
+        now = int(current_time)
+        minute_key = f"rl:m:{client_ip}:{now // 60}"
+        hour_key = f"rl:h:{client_ip}:{now // 3600}"
+        
+        script = self._hit_script
+        if script is None or script.registered_client is not client:
+            script = self._hit_script = client.register_script(_HIT_SCRIPT)
+        
+        # Check and count both windows atomically in one round trip
+        minute_count, hour_count = await script(keys=[minute_key, hour_key], args=[_RPM, _RPH])
+        return minute_count, hour_count
+    
+    async def check(self, scope: Scope) -> Tuple[Optional[Response], List[Tuple[str, str]]]:
+        """
+        Count a request and decide whether it may proceed
+        
+        Args:
+            scope: ASGI HTTP connection scope
+            
+        Returns:
+            Tuple of (429 response to send or None, rate limit headers to add to the response)
+        """
+        # Skip rate limiting for health check and docs
+        if not _RATE_LIMIT_ENABLED or is_rate_limit_excluded(scope["path"]):
+            return None, []
+        
         # Get client IP
-        client_ip = self._get_client_ip(request)
+        client_ip = self._get_client_ip(scope)
         current_time = time()
         
-        # Check per-minute limit
-        minute_requests = self.requests_per_minute[client_ip]
-        minute_requests = [ts for ts in minute_requests if ts > current_time - 60]
+        minute_count = hour_count = None
+        if redis_client.client is not None:
+            try:
+                minute_count, hour_count = await self._hit_redis(redis_client.client, client_ip, current_time)
+            except RedisError as e:
+                # Log once per interval instead of on every request while Redis is down
+                if current_time - self._last_redis_error_log >= _REDIS_ERROR_LOG_INTERVAL:
+                    self._last_redis_error_log = current_time
+                    logger.error("Redis rate limit check failed, using in-process fallback: %s", e)
+        if minute_count is None:
+            minute_count, hour_count = self._hit_memory(client_ip, current_time)
         
-        if len(minute_requests) >= settings.RATE_LIMIT_PER_MINUTE:
-            logger.warning(f"Rate limit exceeded (per minute) for IP: {client_ip}")
-            raise HTTPException(
+        # Check per-minute limit
+        if minute_count > _RPM:
+            logger.warning("Rate limit exceeded (per minute) for IP: %s", client_ip)
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded. Maximum {settings.RATE_LIMIT_PER_MINUTE} requests per minute.",
+                content={"detail": f"Rate limit exceeded. Maximum {_RPM} requests per minute."},
                 headers={"Retry-After": "60"},
             )
+            return response, []
         
         # Check per-hour limit
-        hour_requests = self.requests_per_hour[client_ip]
-        hour_requests = [ts for ts in hour_requests if ts > current_time - 3600]
-        
-        if len(hour_requests) >= settings.RATE_LIMIT_PER_HOUR:
-            logger.warning(f"Rate limit exceeded (per hour) for IP: {client_ip}")
-            raise HTTPException(
+        if hour_count > _RPH:
+            logger.warning("Rate limit exceeded (per hour) for IP: %s", client_ip)
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded. Maximum {settings.RATE_LIMIT_PER_HOUR} requests per hour.",
+                content={"detail": f"Rate limit exceeded. Maximum {_RPH} requests per hour."},
                 headers={"Retry-After": "3600"},
             )
+            return response, []
         
-        # Record request
-        minute_requests.append(current_time)
-        hour_requests.append(current_time)
-        self.requests_per_minute[client_ip] = minute_requests
-        self.requests_per_hour[client_ip] = hour_requests
-        
-        # Add rate limit headers
-        response = await call_next(request)
-        response.headers["X-RateLimit-Limit-Minute"] = str(settings.RATE_LIMIT_PER_MINUTE)
-        response.headers["X-RateLimit-Remaining-Minute"] = str(settings.RATE_LIMIT_PER_MINUTE - len(minute_requests))
-        response.headers["X-RateLimit-Limit-Hour"] = str(settings.RATE_LIMIT_PER_HOUR)
-        response.headers["X-RateLimit-Remaining-Hour"] = str(settings.RATE_LIMIT_PER_HOUR - len(hour_requests))
-        
-        return response
-
+        return None, [
+            ("X-RateLimit-Limit-Minute", str(_RPM)),
+            ("X-RateLimit-Remaining-Minute", str(_RPM - minute_count)),
+            ("X-RateLimit-Limit-Hour", str(_RPH)),
+            ("X-RateLimit-Remaining-Hour", str(_RPH - hour_count)),
+        ]
@@ -1,106 +1,143 @@
 """
 Security middleware for API key authentication and security headers
 """
-from fastapi import Request, HTTPException, status
+import hmac
+from typing import Iterable, Optional
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.config import settings
+from app.middleware.path_filter import is_auth_excluded
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Security headers added to every response, pre-encoded for the raw ASGI header list
+_SECURITY_HEADERS = (
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+)
+# Existing headers overwritten by the security headers, plus the server header (removed for security)
+_REPLACED_HEADER_NAMES = frozenset(name for name, _ in _SECURITY_HEADERS) | {b"server"}
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to all responses"""
+
+def _client_host(scope: Scope) -> str:
+    """Get client host from the ASGI scope"""
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def apply_security_headers(message: Message):
+    """
+    Add security headers to a response and strip the server header
     
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+    Rewrites the raw header list in one pass instead of individual
+    case-insensitive MutableHeaders updates.
+    
+    Args:
+        message: http.response.start message
+    """
+    headers = [
+        (name, value) for name, value in message.get("headers", ())
+        if name.lower() not in _REPLACED_HEADER_NAMES
+    ]
+    headers.extend(_SECURITY_HEADERS)
+    message["headers"] = headers
+
+
+class SecurityHeadersMiddleware:
+    """Add security headers to all responses (pure ASGI)"""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Remove server header for security
-        if "server" in response.headers:
-            del response.headers["server"]
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                apply_security_headers(message)
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_wrapper)
 
 
-class APIKeyMiddleware(BaseHTTPMiddleware):
-    """API Key authentication middleware"""
+class APIKeyAuth:
+    """API key validation used by EdgeMiddleware"""
     
-    def __init__(self, app, exclude_paths: list = None):
-        super().__init__(app)
+    def __init__(self, exclude_paths: Optional[Iterable[str]] = None):
+        # Expected key as bytes for constant-time comparison (empty if not configured)
+        self._expected_key = settings.API_KEY.strip().encode()
+        # Configured header name, lowercased like ASGI header keys
+        self._api_key_header = settings.API_KEY_HEADER.lower()
+        # Shared cached classification by default; custom paths use their own set
         if exclude_paths is not None:
-            self.exclude_paths = exclude_paths
+            self._is_excluded = frozenset(exclude_paths).__contains__
         else:
-            self.exclude_paths = [
-                "/",
-                "/docs",
-                "/redoc",
-                "/openapi.json",
-                "/api/v1/health"
-            ]
+            self._is_excluded = is_auth_excluded
     
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
+    def check(self, scope: Scope) -> Optional[JSONResponse]:
+        """
+        Check the API key of a request unless its path is excluded
+        
+        Args:
+            scope: ASGI HTTP connection scope
+            
+        Returns:
+            Error response to send, or None if the request is authorized
+        """
+        path = scope["path"]
         
         # Skip API key check for excluded paths (exact match only)
-        is_excluded = path in self.exclude_paths
+        if self._is_excluded(path):
+            return None
+        
+        return self._check_api_key(scope, path)
+    
+    def _check_api_key(self, scope: Scope, path: str) -> Optional[JSONResponse]:
+        """
+        Validate the API key of a request
         
-        if is_excluded:
-            return await call_next(request)
+        Args:
+            scope: ASGI connection scope
+            path: Request path
+            
+        Returns:
+            Error response to send, or None if the request is authorized
+        """
+        headers = Headers(scope=scope)
         
         # Require API key to be configured
-        if not settings.API_KEY or settings.API_KEY.strip() == "":
+        if not self._expected_key:
             logger.error("API_KEY not configured in .env file. Authentication is required!")
             return JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={"detail": "API key authentication is not configured. Please set API_KEY in .env file."},
             )
         
-        # Get API key from header (case-insensitive)
-        api_key = None
-        
-        # Try different header name variations (case-insensitive)
-        header_variations = [
-            settings.API_KEY_HEADER,
-            settings.API_KEY_HEADER.lower(),
-            "x-api-key",
-            "X-API-Key"
-        ]
-        
-        for header_name in header_variations:
-            api_key = request.headers.get(header_name)
-            if api_key:
-                break
-        
-        # Also check all headers (case-insensitive search)
-        if not api_key:
-            for header_name, header_value in request.headers.items():
-                if header_name.lower() == "x-api-key" or header_name.lower() == settings.API_KEY_HEADER.lower():
-                    api_key = header_value
-                    break
+        # Get API key from header (Starlette header lookup is already case-insensitive)
+        api_key = headers.get("x-api-key") or headers.get(self._api_key_header)
         
         if not api_key:
-            logger.warning(f"API key missing from request: {path} from {request.client.host if request.client else 'unknown'}")
+            logger.warning("API key missing from request: %s from %s", path, _client_host(scope))
             return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "API key required. Please provide X-API-Key header."},
                 headers={"WWW-Authenticate": "ApiKey"},
             )
         
-        # Validate API key
-        if api_key.strip() != settings.API_KEY.strip():
-            logger.warning(f"Invalid API key attempt: {path} from {request.client.host if request.client else 'unknown'}")
+        # Validate API key (constant time, does not leak matching prefix or length)
+        if not hmac.compare_digest(api_key.strip().encode(), self._expected_key):
+            logger.warning("Invalid API key attempt: %s from %s", path, _client_host(scope))
             return JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"detail": "Invalid API key."},
             )
         
-        return await call_next(request)
-
+        return None
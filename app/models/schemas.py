@@ -1,13 +1,15 @@
 """
 Pydantic models for request/response validation
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 
 class HealthResponse(BaseModel):
     """Health check response model"""
+    model_config = ConfigDict(frozen=True)
+    
     status: str
     version: str
     timestamp: datetime
@@ -16,6 +18,8 @@ class HealthResponse(BaseModel):
 
 class ErrorResponse(BaseModel):
     """Error response model"""
+    model_config = ConfigDict(frozen=True)
+    
     detail: str
     message: Optional[str] = None
 
@@ -43,14 +47,21 @@ class ArticleResponse(ArticleBase):
     id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    # Extra row columns (e.g. the windowed total) are dropped, strings kept as stored;
+    # instances are read-only once built from a row
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+        str_strip_whitespace=False,
+        frozen=True
+    )
 
 
 class ArticleListResponse(BaseModel):
     """Article list response model"""
     items: List[ArticleResponse]
     total: int
-    page: int = 1
+    page: Optional[int] = 1  # None for cursor pages, which have no page number
     page_size: int = 10
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page by keyset
 
@@ -0,0 +1,54 @@
+"""
+Redis connection module shared by rate limiting and caching
+"""
+from typing import Optional
+import redis.asyncio as redis
+from app.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class RedisClient:
+    """Redis connection manager (optional, enabled by REDIS_URL)"""
+    
+    def __init__(self):
+        self.client: Optional[redis.Redis] = None
+    
+    async def connect(self):
+        """
+        Create Redis connection pool if REDIS_URL is configured
+        
+        Failures are logged and leave the client unset, so callers fall back
+        to their in-process implementations.
+        """
+        if not settings.REDIS_URL:
+            logger.info("REDIS_URL not configured, using in-process rate limiting")
+            return
+        
+        # Short timeouts so a stalled Redis raises (and requests fall back) instead of hanging
+        client = redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT
+        )
+        try:
+            await client.ping()
+        except Exception as e:
+            logger.error(f"Redis connection failed, using in-process fallback: {e}")
+            await client.aclose()
+            return
+        
+        self.client = client
+        logger.info("Redis connection pool created successfully")
+    
+    async def disconnect(self):
+        """Close Redis connection pool"""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+            logger.info("Redis connection pool closed")
+
+
+# Global Redis instance
+redis_client = RedisClient()
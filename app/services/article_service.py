@@ -1,13 +1,123 @@
 """
 Article service layer for business logic
 """
-from typing import List, Optional
+from datetime import datetime
+from time import monotonic
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from app.config import settings
 from app.database import Database
 from app.models.schemas import ArticleCreate, ArticleUpdate, ArticleResponse
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# WHERE clause per (has date_from, has date_to); SQL is built once at import, not per call
+_DATE_FILTERS = {
+    (False, False): "",
+    (True, False): "WHERE created_at >= :date_from",
+    (False, True): "WHERE created_at <= :date_to",
+    (True, True): "WHERE created_at >= :date_from AND created_at <= :date_to",
+}
+
+_SQL_LIST = {
+    key: f"""
+    SELECT id, title, content, created_at
+    FROM running_articles
+    {where_clause}
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit_val OFFSET :offset_val
+"""
+    for key, where_clause in _DATE_FILTERS.items()
+}
+
+# Keyset (seek) variant: continue after a (created_at, id) cursor instead of skipping
+# OFFSET rows, served by the (created_at DESC, id DESC) index
+_CURSOR_CONDITION = "(created_at, id) < (:cursor_ts, :cursor_id)"
+_SQL_LIST_AFTER_CURSOR = {
+    key: f"""
+    SELECT id, title, content, created_at
+    FROM running_articles
+    {where_clause + " AND " if where_clause else "WHERE "}{_CURSOR_CONDITION}
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit_val
+"""
+    for key, where_clause in _DATE_FILTERS.items()
+}
+
+# Page query that also returns the filtered total via a window function (one round trip)
+_SQL_LIST_WITH_TOTAL = {
+    key: f"""
+    SELECT id, title, content, created_at, COUNT(*) OVER () AS total
+    FROM running_articles
+    {where_clause}
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit_val OFFSET :offset_val
+"""
+    for key, where_clause in _DATE_FILTERS.items()
+}
+
+_SQL_COUNT = {
+    key: f"SELECT COUNT(*) FROM running_articles {where_clause}"
+    for key, where_clause in _DATE_FILTERS.items()
+}
+
+# Planner row estimate for the unfiltered total: a catalog lookup instead of a full scan
+_SQL_COUNT_ESTIMATE = (
+    "SELECT reltuples::BIGINT AS estimate FROM pg_class "
+    "WHERE oid = 'running_articles'::regclass"
+)
+# Below this many estimated rows an exact COUNT(*) is cheap, so it is used instead
+_EXACT_COUNT_BELOW = 10000
+
+# Last planner estimate as (monotonic timestamp, reltuples), kept per worker
+_last_estimate: Tuple[float, int] = (float("-inf"), -1)
+
+# Single-row statements; the same str objects are reused on every call
+_SQL_GET_BY_ID = """
+    SELECT id, title, content, created_at
+    FROM running_articles
+    WHERE id = :article_id
+"""
+
+_SQL_INSERT = """
+    INSERT INTO running_articles (title, content)
+    VALUES (:title, :content)
+    RETURNING id, title, content, created_at
+"""
+
+# Fixed UPDATE for any field subset: NULL parameters keep the current column value
+_SQL_UPDATE = """
+    UPDATE running_articles
+    SET title = COALESCE(:title, title),
+        content = COALESCE(:content, content)
+    WHERE id = :article_id
+    RETURNING id, title, content, created_at
+"""
+
+_SQL_DELETE = "DELETE FROM running_articles WHERE id = :article_id RETURNING id"
+
+
+def _date_params(
+    date_from: Optional[datetime],
+    date_to: Optional[datetime]
+) -> Tuple[Tuple[bool, bool], Dict[str, datetime]]:
+    """
+    Get the query key and bind parameters for optional date filters
+    
+    Args:
+        date_from: Filter articles created at or after this datetime
+        date_to: Filter articles created at or before this datetime
+        
+    Returns:
+        Tuple of (key into the precomputed queries, date parameters)
+    """
+    params = {}
+    if date_from is not None:
+        params["date_from"] = date_from
+    if date_to is not None:
+        params["date_to"] = date_to
+    return (date_from is not None, date_to is not None), params
+
 
 class ArticleService:
     """Service for article-related operations"""
@@ -19,61 +129,82 @@ class ArticleService:
         self,
         limit: int = 10,
         offset: int = 0,
-        date_from: Optional[str] = None,
-        date_to: Optional[str] = None
-    ) -> List[dict]:
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        cursor: Optional[Tuple[datetime, int]] = None
+    ) -> List[Mapping[str, Any]]:
         """
         Get all articles with pagination and optional date filtering
         
         Args:
             limit: Number of articles to return
-            offset: Number of articles to skip
-            date_from: Filter articles from this date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)
-            date_to: Filter articles until this date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)
+            offset: Number of articles to skip (ignored when cursor is given)
+            date_from: Filter articles created at or after this datetime
+            date_to: Filter articles created at or before this datetime
+            cursor: (created_at, id) of the last article of the previous page;
+                seeks past it instead of scanning offset rows
             
         Returns:
-            List of article dictionaries
+            List of article row mappings
         """
         try:
-            conditions = []
-            params = {}
-            param_num = 1
+            key, params = _date_params(date_from, date_to)
+            if cursor is not None:
+                query = _SQL_LIST_AFTER_CURSOR[key]
+                params["cursor_ts"], params["cursor_id"] = cursor
+                return await self.db.fetch(query, **params, limit_val=limit)
             
-            # Add date filtering
-            if date_from:
-                param_name = f"date_from_{param_num}"
-                conditions.append(f"created_at >= :{param_name}")
-                params[param_name] = date_from
-                param_num += 1
+            query = _SQL_LIST[key]
             
-            if date_to:
-                param_name = f"date_to_{param_num}"
-                conditions.append(f"created_at <= :{param_name}")
-                params[param_name] = date_to
-                param_num += 1
-            
-            # Build WHERE clause
-            where_clause = ""
-            if conditions:
-                where_clause = "WHERE " + " AND ".join(conditions)
+            rows = await self.db.fetch(query, **params, limit_val=limit, offset_val=offset)
+            return rows
+        except Exception as e:
+            logger.error("Error fetching articles: %s", e)
+            raise
+    
+    async def list_with_total(
+        self,
+        limit: int = 10,
+        offset: int = 0,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> Tuple[List[Mapping[str, Any]], int]:
+        """
+        Get a page of articles together with the total count
+        
+        Usually one query whose rows also carry the total column (ignored by the
+        response models). Unfiltered pages of large tables instead use the cached
+        planner estimate as the total, so the page query does not count every row.
+        
+        Args:
+            limit: Number of articles to return
+            offset: Number of articles to skip
+            date_from: Filter articles created at or after this datetime
+            date_to: Filter articles created at or before this datetime
             
-            # Add pagination parameters
-            params['limit_val'] = limit
-            params['offset_val'] = offset
+        Returns:
+            Tuple of (article row mappings, total number of matching articles).
+            Rows also carry the total column, which response models ignore.
+        """
+        try:
+            key, params = _date_params(date_from, date_to)
+            if not params:
+                estimate = await self._planner_estimate()
+                if estimate >= _EXACT_COUNT_BELOW:
+                    rows = await self.get_all_articles(limit=limit, offset=offset)
+                    return rows, estimate
             
-            query = f"""
-                SELECT id, title, content, created_at
-                FROM running_articles
-                {where_clause}
-                ORDER BY created_at DESC
-                LIMIT :limit_val OFFSET :offset_val
-            """
+            query = _SQL_LIST_WITH_TOTAL[key]
             
-            rows = await self.db.fetch(query, **params)
-            return rows
+            rows = await self.db.fetch(query, **params, limit_val=limit, offset_val=offset)
         except Exception as e:
-            logger.error(f"Error fetching articles: {e}")
+            logger.error("Error fetching articles: %s", e)
             raise
+        
+        if rows:
+            return rows, int(rows[0]["total"])
+        # Page past the end returns no rows to read the total from
+        return rows, await self.count_articles(date_from=date_from, date_to=date_to)
     
     async def get_article_by_id(self, article_id: int) -> Optional[dict]:
         """
@@ -86,15 +217,10 @@ class ArticleService:
             Article dictionary or None if not found
         """
         try:
-            query = """
-                SELECT id, title, content, created_at
-                FROM running_articles
-                WHERE id = :article_id
-            """
-            row = await self.db.fetchrow(query, article_id=article_id)
+            row = await self.db.fetchrow(_SQL_GET_BY_ID, article_id=article_id)
             return row if row else None
         except Exception as e:
-            logger.error(f"Error fetching article {article_id}: {e}")
+            logger.error("Error fetching article %s: %s", article_id, e)
             raise
     
     async def create_article(self, article: ArticleCreate) -> dict:
@@ -108,19 +234,14 @@ class ArticleService:
             Created article dictionary
         """
         try:
-            query = """
-                INSERT INTO running_articles (title, content)
-                VALUES (:title, :content)
-                RETURNING id, title, content, created_at
-            """
             row = await self.db.fetchrow(
-                query,
+                _SQL_INSERT,
                 title=article.title,
                 content=article.content
             )
             return row
         except Exception as e:
-            logger.error(f"Error creating article: {e}")
+            logger.error("Error creating article: %s", e)
             raise
     
     async def update_article(
@@ -139,39 +260,19 @@ class ArticleService:
             Updated article dictionary or None if not found
         """
         try:
-            # Build dynamic update query
-            updates = []
-            params = {}
-            param_num = 1
-            
-            if article.title is not None:
-                param_name = f"title_{param_num}"
-                updates.append(f"title = :{param_name}")
-                params[param_name] = article.title
-                param_num += 1
-            
-            if article.content is not None:
-                param_name = f"content_{param_num}"
-                updates.append(f"content = :{param_name}")
-                params[param_name] = article.content
-                param_num += 1
-            
-            if not updates:
+            if article.title is None and article.content is None:
+                # Nothing to change; skip the no-op write
                 return await self.get_article_by_id(article_id)
             
-            params['article_id'] = article_id
-            
-            query = f"""
-                UPDATE running_articles
-                SET {', '.join(updates)}
-                WHERE id = :article_id
-                RETURNING id, title, content, created_at
-            """
-            
-            row = await self.db.fetchrow(query, **params)
+            row = await self.db.fetchrow(
+                _SQL_UPDATE,
+                title=article.title,
+                content=article.content,
+                article_id=article_id
+            )
             return row if row else None
         except Exception as e:
-            logger.error(f"Error updating article {article_id}: {e}")
+            logger.error("Error updating article %s: %s", article_id, e)
             raise
     
     async def delete_article(self, article_id: int) -> bool:
@@ -185,55 +286,69 @@ class ArticleService:
             True if deleted, False if not found
         """
         try:
-            query = "DELETE FROM running_articles WHERE id = :article_id RETURNING id"
-            result = await self.db.fetchrow(query, article_id=article_id)
+            result = await self.db.fetchrow(_SQL_DELETE, article_id=article_id)
             return result is not None
         except Exception as e:
-            logger.error(f"Error deleting article {article_id}: {e}")
+            logger.error("Error deleting article %s: %s", article_id, e)
             raise
     
     async def count_articles(
         self,
-        date_from: Optional[str] = None,
-        date_to: Optional[str] = None
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
     ) -> int:
         """
         Get total count of articles with optional date filtering
         
         Args:
-            date_from: Filter articles from this date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)
-            date_to: Filter articles until this date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)
+            date_from: Filter articles created at or after this datetime
+            date_to: Filter articles created at or before this datetime
             
         Returns:
-            Total number of articles
+            Total number of articles (approximate for large tables when unfiltered)
         """
         try:
-            conditions = []
-            params = {}
-            param_num = 1
-            
-            # Add date filtering
-            if date_from:
-                param_name = f"date_from_{param_num}"
-                conditions.append(f"created_at >= :{param_name}")
-                params[param_name] = date_from
-                param_num += 1
+            key, params = _date_params(date_from, date_to)
+            if not params:
+                return await self._estimate_total()
             
-            if date_to:
-                param_name = f"date_to_{param_num}"
-                conditions.append(f"created_at <= :{param_name}")
-                params[param_name] = date_to
-                param_num += 1
-            
-            # Build WHERE clause
-            where_clause = ""
-            if conditions:
-                where_clause = "WHERE " + " AND ".join(conditions)
-            
-            query = f"SELECT COUNT(*) FROM running_articles {where_clause}"
-            count = await self.db.fetchval(query, **params) if params else await self.db.fetchval(query)
+            query = _SQL_COUNT[key]
+            count = await self.db.fetchval(query, **params)
             return int(count) if count is not None else 0
         except Exception as e:
-            logger.error(f"Error counting articles: {e}")
+            logger.error("Error counting articles: %s", e)
             raise
-
+    
+    async def _planner_estimate(self) -> int:
+        """
+        Get the planner's row estimate for the articles table
+        
+        The value is reused for ARTICLE_COUNT_ESTIMATE_TTL seconds.
+        
+        Returns:
+            Estimated row count (-1 if the table was never analyzed)
+        """
+        global _last_estimate
+        
+        checked_at, estimate = _last_estimate
+        now = monotonic()
+        if now - checked_at >= settings.ARTICLE_COUNT_ESTIMATE_TTL:
+            value = await self.db.fetchval(_SQL_COUNT_ESTIMATE)
+            estimate = int(value) if value is not None else -1
+            _last_estimate = (now, estimate)
+        return estimate
+    
+    async def _estimate_total(self) -> int:
+        """
+        Get the unfiltered article count, estimated for large tables
+        
+        Small tables, or tables not yet analyzed, are counted exactly.
+        
+        Returns:
+            Total number of articles
+        """
+        estimate = await self._planner_estimate()
+        if estimate >= _EXACT_COUNT_BELOW:
+            return estimate
+        count = await self.db.fetchval(_SQL_COUNT[(False, False)])
+        return int(count) if count is not None else 0
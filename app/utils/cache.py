@@ -0,0 +1,143 @@
+"""
+Short-TTL response cache for hot read endpoints
+"""
+import orjson
+from time import monotonic
+from typing import Any, Dict, Optional, Tuple
+from redis.exceptions import RedisError
+from app.config import settings
+from app.redis_client import redis_client
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ResponseCache:
+    """
+    JSON response cache backed by Redis when configured, otherwise in-process
+    
+    Keys are versioned per namespace: writes bump the namespace version instead of
+    deleting keys, so entries stored under an older version are never read again.
+    The in-process fallback is only used with a single worker, since other
+    workers would not see the version bump and could serve stale data.
+    Values must be JSON-serializable (e.g. model_dump(mode="json") output).
+    """
+    
+    def __init__(self, max_local_entries: int = 1024):
+        self._local: Dict[str, Tuple[float, Any]] = {}
+        self._local_versions: Dict[str, int] = {}
+        self._local_enabled = settings.WORKERS <= 1
+        self.max_local_entries = max_local_entries
+    
+    def _prune_local(self):
+        """Drop expired in-process entries, then the oldest ones if still full"""
+        now = monotonic()
+        for key in [k for k, (expires_at, _) in self._local.items() if expires_at <= now]:
+            del self._local[key]
+        while len(self._local) >= self.max_local_entries:
+            del self._local[next(iter(self._local))]
+    
+    async def versioned_key(self, namespace: str, suffix: str) -> Optional[str]:
+        """
+        Build a cache key under the current version of a namespace
+        
+        Args:
+            namespace: Key namespace, invalidated as a whole by invalidate()
+            suffix: Key within the namespace
+            
+        Returns:
+            Cache key, or None if caching is unavailable
+        """
+        client = redis_client.client
+        if client is not None:
+            try:
+                version = await client.get(f"{namespace}ver")
+            except RedisError as e:
+                logger.error("Cache version read failed for %s: %s", namespace, e)
+                return None
+            return f"{namespace}{int(version or 0)}:{suffix}"
+        
+        if not self._local_enabled:
+            return None
+        return f"{namespace}{self._local_versions.get(namespace, 0)}:{suffix}"
+    
+    async def get(self, key: Optional[str]) -> Optional[Any]:
+        """
+        Get a cached value
+        
+        Args:
+            key: Cache key from versioned_key (None is always a miss)
+            
+        Returns:
+            Cached value or None on miss
+        """
+        if key is None:
+            return None
+        
+        client = redis_client.client
+        if client is not None:
+            try:
+                raw = await client.get(key)
+            except RedisError as e:
+                logger.error("Cache read failed for %s: %s", key, e)
+                return None
+            return orjson.loads(raw) if raw is not None else None
+        
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            self._local.pop(key, None)
+            return None
+        return value
+    
+    async def set(self, key: Optional[str], value: Any, ttl: float):
+        """
+        Cache a value
+        
+        Args:
+            key: Cache key from versioned_key (None skips caching)
+            value: JSON-serializable value
+            ttl: Time to live in seconds (0 disables caching)
+        """
+        if key is None or ttl <= 0:
+            return
+        
+        client = redis_client.client
+        if client is not None:
+            try:
+                await client.set(key, orjson.dumps(value), px=int(ttl * 1000))
+            except RedisError as e:
+                logger.error("Cache write failed for %s: %s", key, e)
+            return
+        
+        if not self._local_enabled:
+            return
+        if len(self._local) >= self.max_local_entries:
+            self._prune_local()
+        self._local[key] = (monotonic() + ttl, value)
+    
+    async def invalidate(self, namespace: str):
+        """
+        Invalidate all cached values of a namespace by bumping its version
+        
+        Args:
+            namespace: Key namespace passed to versioned_key
+        """
+        client = redis_client.client
+        if client is not None:
+            try:
+                await client.incr(f"{namespace}ver")
+            except RedisError as e:
+                logger.error("Cache invalidation failed for %s: %s", namespace, e)
+            return
+        
+        self._local_versions[namespace] = self._local_versions.get(namespace, 0) + 1
+        # Old-version entries are unreachable now; free them right away
+        for key in [k for k in self._local if k.startswith(namespace)]:
+            del self._local[key]
+
+
+# Global response cache instance
+response_cache = ResponseCache()
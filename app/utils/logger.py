@@ -3,12 +3,21 @@ Logging configuration for the application
 """
 import logging
 import sys
+from functools import lru_cache
 from app.config import settings
 
+# Level and formatter shared by all application loggers
+_LEVEL = logging.DEBUG if settings.DEBUG else logging.INFO
+_FORMATTER = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
 
+
+@lru_cache(maxsize=None)
 def setup_logger(name: str = __name__) -> logging.Logger:
     """
-    Set up and configure logger
+    Set up and configure logger (memoized per name)
     
     Args:
         name: Logger name (typically __name__)
@@ -19,21 +28,14 @@ def setup_logger(name: str = __name__) -> logging.Logger:
     logger = logging.getLogger(name)
     
     if not logger.handlers:
-        logger.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
+        logger.setLevel(_LEVEL)
         
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
-        
-        # Formatter
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-        console_handler.setFormatter(formatter)
+        console_handler.setLevel(_LEVEL)
+        console_handler.setFormatter(_FORMATTER)
         
         logger.addHandler(console_handler)
         logger.propagate = False
     
     return logger
-
@@ -16,35 +16,36 @@ if os.path.exists(env_file):
     
     # Try to read DATABASE_URL
     try:
+        # Stream the file and stop reading at the first DATABASE_URL line
         with open(env_file, 'r') as f:
-            content = f.read()
-            if 'DATABASE_URL' in content:
-                # Extract DATABASE_URL
-                for line in content.split('\n'):
-                    if line.startswith('DATABASE_URL='):
-                        db_url = line.split('=', 1)[1].strip()
-                        parsed = urlparse(db_url)
-                        print(f"\nCurrent DATABASE_URL configuration:")
-                        print(f"  Host: {parsed.hostname}")
-                        print(f"  Port: {parsed.port}")
-                        print(f"  User: {parsed.username}")
-                        print(f"  Database: {parsed.path.lstrip('/')}")
-                        print(f"  Has Password: {'Yes' if parsed.password else 'No'}")
-                        
-                        # Check for placeholder
-                        if '[YOUR-PASSWORD]' in db_url or '[PASSWORD]' in db_url:
-                            print("\n[WARNING] Password placeholder detected!")
-                            print("   Replace [YOUR-PASSWORD] with your actual password")
-                        
-                        # Check hostname format
-                        if parsed.hostname and 'pooler.supabase.com' in parsed.hostname:
-                            print("\n[OK] Using Connection Pooling URL (recommended)")
-                        elif parsed.hostname and 'db.' in parsed.hostname and '.supabase.co' in parsed.hostname:
-                            print("\n[WARNING] Using Direct Connection URL")
-                            print("   Consider switching to Connection Pooling URL for better reliability")
-                        break
+            for line in f:
+                if line.startswith('DATABASE_URL='):
+                    db_url = line.split('=', 1)[1].strip()
+                    break
             else:
                 print("[WARNING] DATABASE_URL not found in .env file")
+                db_url = None
+        
+        if db_url:
+            parsed = urlparse(db_url)
+            print(f"\nCurrent DATABASE_URL configuration:")
+            print(f"  Host: {parsed.hostname}")
+            print(f"  Port: {parsed.port}")
+            print(f"  User: {parsed.username}")
+            print(f"  Database: {parsed.path.lstrip('/')}")
+            print(f"  Has Password: {'Yes' if parsed.password else 'No'}")
+            
+            # Check for placeholder
+            if '[YOUR-PASSWORD]' in db_url or '[PASSWORD]' in db_url:
+                print("\n[WARNING] Password placeholder detected!")
+                print("   Replace [YOUR-PASSWORD] with your actual password")
+            
+            # Check hostname format
+            if parsed.hostname and 'pooler.supabase.com' in parsed.hostname:
+                print("\n[OK] Using Connection Pooling URL (recommended)")
+            elif parsed.hostname and 'db.' in parsed.hostname and '.supabase.co' in parsed.hostname:
+                print("\n[WARNING] Using Direct Connection URL")
+                print("   Consider switching to Connection Pooling URL for better reliability")
     except Exception as e:
         print(f"Error reading .env: {e}")
 else:
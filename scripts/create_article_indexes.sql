@@ -0,0 +1,7 @@
+-- Indexes for running_articles table
+-- Run this in Supabase SQL Editor or via MCP migration
+
+-- Composite index for newest-first listing and keyset (cursor) pagination:
+-- ORDER BY created_at DESC, id DESC and WHERE (created_at, id) < (:cursor_ts, :cursor_id)
+CREATE INDEX IF NOT EXISTS idx_running_articles_created_at_id
+ON running_articles (created_at DESC, id DESC);
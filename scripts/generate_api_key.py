@@ -1,7 +1,28 @@
 """
 Generate a secure API key for use in .env file
 """
+import base64
 import secrets
+from typing import List
+
+
+def generate_api_keys(n: int, length: int = 32) -> List[str]:
+    """
+    Generate several secure random API keys from a single CSPRNG read
+    
+    Args:
+        n: Number of keys to generate
+        length: Length of each key in bytes (default: 32)
+        
+    Returns:
+        List of URL-safe base64 encoded random strings (no padding)
+    """
+    raw = secrets.token_bytes(n * length)
+    return [
+        base64.urlsafe_b64encode(raw[i * length:(i + 1) * length]).rstrip(b'=').decode('ascii')
+        for i in range(n)
+    ]
+
 
 def generate_api_key(length: int = 32) -> str:
     """
@@ -13,7 +34,7 @@ def generate_api_key(length: int = 32) -> str:
     Returns:
         URL-safe base64 encoded random string
     """
-    return secrets.token_urlsafe(length)
+    return generate_api_keys(1, length)[0]
 
 
 if __name__ == "__main__":